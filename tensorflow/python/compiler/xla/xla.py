@@ -14,13 +14,8 @@
 # =============================================================================
 """xla is an experimental library that provides XLA support APIs."""
 
-from __future__ import absolute_import
-from __future__ import division
-from __future__ import print_function
-
 import contextlib
-
-from six.moves import xrange  # pylint: disable=redefined-builtin
+import weakref
 
 from tensorflow.compiler.jit.ops import xla_ops
 from tensorflow.compiler.jit.ops import xla_ops_grad  # pylint: disable=unused-import
@@ -43,15 +38,23 @@ from tensorflow.python.util.tf_export import tf_export
 _XLA_COMPILE_ATTR = '_xla_compile_id'
 _MAX_WARNING_LINES = 5
 
+# Argument specs of functions passed to `check_function_argument_count`, which
+# is called again for every compilation of the same function.
+_ARG_SPEC_CACHE = weakref.WeakKeyDictionary()
+
+# `tf.function`s wrapping computations passed to `compile_cached` in eager
+# mode.
+_EAGER_COMPILE_FUNCTION_CACHE = weakref.WeakKeyDictionary()
+
 # Operations that indicate some error in the users graph. For example, XLA
 # computation should not have any Placeholder op.
-_DENYLISTED_OPS = set([
+_DENYLISTED_OPS = frozenset([
     'Placeholder',
 ])
 
 # XLA doesn't currently support reading of intermediate tensors, thus some ops
 # are not supported.
-_UNSUPPORTED_OPS = set([
+_UNSUPPORTED_OPS = frozenset([
     'AudioSummary',
     'AudioSummaryV2',
     'HistogramSummary',
@@ -127,6 +130,71 @@ def compile(computation, inputs=None):  # pylint: disable=redefined-builtin
   return _compile_internal(computation, inputs)
 
 
+def compile_cached(computation, inputs=None):
+  """Like `compile`, but reuses eager traces of `computation` across calls.
+
+  In eager mode, `compile` traces `computation` again on every call. This
+  function instead keeps one `tf.function` per `computation`, which only
+  retraces for inputs with a new signature. It is opt-in because the cached
+  function changes the semantics of `computation`:
+
+    * Variables created by `computation` are created on the first call only.
+      A later call that retraces, e.g. for inputs of a new shape, raises an
+      error if `computation` creates variables.
+    * Python state that `computation` closes over is captured when it is
+      traced. Later changes to that state are not seen until a retrace.
+
+  Outside of eager mode this is the same as `compile`.
+
+  Args:
+    computation: A Python function, as passed to `compile`.
+    inputs: A list of inputs or `None`, as passed to `compile`.
+
+  Returns:
+    Same as `compile`.
+  """
+  if context.executing_eagerly():
+    return _get_eager_compile_function(computation)(inputs)
+
+  return _compile_internal(computation, inputs)
+
+
+def _get_eager_compile_function(computation):
+  """Returns a `tf.function` running `computation` through `xla.compile`.
+
+  The function is cached per `computation`, so repeated eager calls with inputs
+  of the same signature reuse the existing trace instead of retracing.
+
+  Args:
+    computation: A Python function, as passed to `compile_cached`.
+
+  Returns:
+    A `tf.function` that takes the `inputs` argument of `compile`.
+  """
+  try:
+    return _EAGER_COMPILE_FUNCTION_CACHE[computation]
+  except (KeyError, TypeError):
+    pass
+
+  try:
+    # Only hold a weak reference so the cache entry does not keep
+    # `computation` alive.
+    computation_ref = weakref.ref(computation)
+  except TypeError:
+    computation_ref = lambda: computation
+
+  @def_function.function
+  def xla_compile_wrapper(inputs):
+    return _compile_internal(computation_ref(), inputs)
+
+  try:
+    _EAGER_COMPILE_FUNCTION_CACHE[computation] = xla_compile_wrapper
+  except TypeError:
+    # `computation` is not hashable or cannot be weakly referenced.
+    pass
+  return xla_compile_wrapper
+
+
 class XLACompileContext(control_flow_ops.XLAControlFlowContext):
   """A `ControlFlowContext` for nodes inside an XLA computation cluster.
 
@@ -160,18 +228,29 @@ class XLACompileContext(control_flow_ops.XLAControlFlowContext):
     self._name_as_bytes = compat.as_bytes(name)
     self._unsupported_ops = []
     self._pivot = pivot
+    # The chain of this context and all enclosing contexts. Outer contexts are
+    # fixed at construction time, so it is safe to compute this once.
+    context_chain = []
+    context = self
+    while context is not None:
+      context_chain.append(context)
+      context = context._outer_context  # pylint: disable=protected-access
+    self._context_chain = tuple(context_chain)
 
   def report_unsupported_operations(self):
     if self._unsupported_ops:
-      op_str = '\n'.join([
-          '  %s (%s)' % (op.type, op.name)
-          for op in self._unsupported_ops[:_MAX_WARNING_LINES]
-      ])
+      num_unsupported_ops = len(self._unsupported_ops)
+      if num_unsupported_ops > _MAX_WARNING_LINES:
+        reported_ops = self._unsupported_ops[:_MAX_WARNING_LINES]
+      else:
+        reported_ops = self._unsupported_ops
+      op_str = '\n'.join(
+          '  %s (%s)' % (op.type, op.name) for op in reported_ops)
       logging.warning('%d unsupported operations found: \n%s',
-                      len(self._unsupported_ops), op_str)
-      if len(self._unsupported_ops) > _MAX_WARNING_LINES:
+                      num_unsupported_ops, op_str)
+      if num_unsupported_ops > _MAX_WARNING_LINES:
         logging.warning('... and %d more',
-                        len(self._unsupported_ops) - _MAX_WARNING_LINES)
+                        num_unsupported_ops - _MAX_WARNING_LINES)
 
   def _RemoveExternalControlEdges(self, op):
     """Remove any external control dependency on this op."""
@@ -200,29 +279,34 @@ class XLACompileContext(control_flow_ops.XLAControlFlowContext):
   def AddOp(self, op):
     """Create op in XLACompileContext and notifies outer context recursively."""
     # pylint: disable=protected-access
-    if op.type in _DENYLISTED_OPS:
+    op_type = op.type
+    op_inputs = op.inputs
+    if op_type in _DENYLISTED_OPS:
       logging.error(
           'Operation of type %s (%s) is not supported in XLA. Execution will '
-          'fail if this op is used in the graph. ', op.type, op.name)
+          'fail if this op is used in the graph. ', op_type, op.name)
 
     # TODO(ycao): Automatically disable summaries instead of reporting them.
-    if op.type in _UNSUPPORTED_OPS:
+    if op_type in _UNSUPPORTED_OPS:
       self._unsupported_ops.append(op)
 
-    if any(x.dtype._is_ref_dtype for x in op.inputs):
-      raise NotImplementedError(
-          'Non-resource Variables are not supported inside XLA computations '
-          '(operator name: %s)' % op.name)
+    for x in op_inputs:
+      if x.dtype._is_ref_dtype:
+        raise NotImplementedError(
+            'Non-resource Variables are not supported inside XLA computations '
+            '(operator name: %s)' % op.name)
 
-    if _XLA_COMPILE_ATTR in op.node_def.attr:
+    node_def_attr = op.node_def.attr
+    if _XLA_COMPILE_ATTR in node_def_attr:
       raise ValueError('XLA compiled computations cannot be nested, (operator '
                        'name: %s)' % op.name)
 
     op._set_attr(
         _XLA_COMPILE_ATTR, attr_value_pb2.AttrValue(s=self._name_as_bytes))
 
-    op.graph.prevent_feeding(op)
-    op.graph.prevent_fetching(op)
+    graph = op.graph
+    graph.prevent_feeding(op)
+    graph.prevent_fetching(op)
 
     # Remove any control edges from outer control flow contexts. These may cause
     # mismatched frame errors. An example is when one of op's inputs is
@@ -230,60 +314,58 @@ class XLACompileContext(control_flow_ops.XLAControlFlowContext):
     (internal_control_inputs,
      external_control_inputs) = self._RemoveExternalControlEdges(op)
 
-    if not op.inputs:
+    if not op_inputs:
       # Add a control edge from the control pivot to this op.
       if not internal_control_inputs:
         # pylint: disable=protected-access
         op._add_control_input(self._pivot)
         # pylint: enable=protected-access
     else:
-      for index in xrange(len(op.inputs)):
-        x = op.inputs[index]
+      for index, x in enumerate(op_inputs):
         real_x = self.AddValue(x)
         if real_x is not x:
           op._update_input(index, real_x)  # pylint: disable=protected-access
 
     if external_control_inputs:
-      # Use an identity to pull control inputs as data inputs. Note that we
-      # ignore ops which don't have outputs. TODO(phawkins): fix that.
-      with ops.control_dependencies(None):
-        self.Enter()
-        external_control_inputs = [
-            array_ops.identity(x.outputs[0]).op
-            for x in external_control_inputs
-            if x.outputs
-        ]
-        self.Exit()
-      # pylint: disable=protected-access
-      op._add_control_inputs(external_control_inputs)
-      # pylint: enable=protected-access
+      # Use a single IdentityN to pull control inputs as data inputs. Note that
+      # we ignore ops which don't have outputs. TODO(phawkins): fix that.
+      external_outputs = [
+          x.outputs[0] for x in external_control_inputs if x.outputs
+      ]
+      if external_outputs:
+        with ops.control_dependencies(None):
+          self.Enter()
+          external_control_input = array_ops.identity_n(external_outputs)[0].op
+          self.Exit()
+        # pylint: disable=protected-access
+        op._add_control_input(external_control_input)
+        # pylint: enable=protected-access
 
     # Mark op's outputs as seen by this context and any outer contexts.
-    output_names = [x.name for x in op.outputs]
-    context = self
-    while context is not None:
-      # pylint: disable=protected-access
-      context._values.update(output_names)
-      context = context._outer_context
-      # pylint: enable=protected-access
+    output_names = tuple(x.name for x in op.outputs)
+    for context in self._context_chain:
+      context._values.update(output_names)  # pylint: disable=protected-access
 
     if self._outer_context:
       self._outer_context.AddInnerOp(op)
 
   def AddValue(self, val):
     """Add `val` to the current context and its outer context recursively."""
-    if val.name in self._values:
-      # Use the real value if it comes from outer context.
-      result = self._external_values.get(val.name)
-      return val if result is None else result
+    name = val.name
+    # Use the real value if it comes from outer context.
+    result = self._external_values.get(name)
+    if result is not None:
+      return result
+    if name in self._values:
+      return val
 
     result = val
-    self._values.add(val.name)
+    self._values.add(name)
     if self._outer_context:
       result = self._outer_context.AddValue(val)
       self._values.add(result.name)
 
-    self._external_values[val.name] = result
+    self._external_values[name] = result
 
     return result
 
@@ -334,7 +416,7 @@ def _compile_internal(computation, inputs=None):
   if inputs is None:
     inputs = []
 
-  if not isinstance(inputs, collections_abc.Sequence):
+  if not _is_sequence(inputs):
     raise TypeError('inputs must be a list')
 
   # Flatten inputs.
@@ -342,7 +424,8 @@ def _compile_internal(computation, inputs=None):
   # Converts inputs to Tensors.
   flat_inputs = [ops.convert_to_tensor(x) for x in flat_inputs]
 
-  cluster_name = ops.get_default_graph().unique_name('cluster')
+  graph = ops.get_default_graph()
+  cluster_name = graph.unique_name('cluster')
   pivot = control_flow_ops.no_op(name=cluster_name + '/pivot')
   context = XLACompileContext(name=cluster_name, pivot=pivot)
   try:
@@ -351,7 +434,7 @@ def _compile_internal(computation, inputs=None):
     # Add identity ops so even unused inputs are 'consumed' by the
     # computation.
     flat_inputs = [
-        array_ops.identity(x, name='input_{}'.format(i))
+        array_ops.identity(x, name='input_%d' % i)
         for i, x in enumerate(flat_inputs)
     ]
 
@@ -390,7 +473,7 @@ def _compile_internal(computation, inputs=None):
     return control_flow_ops.group(control_deps, name='output_0')
 
   output_tensors = [
-      xla_ops.xla_cluster_output(o, name='output{}'.format(i))
+      xla_ops.xla_cluster_output(o, name='output%d' % i)
       for i, o in enumerate(output_tensors)
   ]
 
@@ -411,6 +494,12 @@ def _compile_internal(computation, inputs=None):
   return output_tensors
 
 
+def _is_sequence(x):
+  """Returns whether `x` is a sequence, checking concrete types first."""
+  return (isinstance(x, (list, tuple)) or
+          isinstance(x, collections_abc.Sequence))
+
+
 def is_flat(outputs):
   """Checks if outputs is a flat structure.
 
@@ -433,9 +522,9 @@ def is_flat(outputs):
   """
   # If outputs is a list or tuple, check if it has any nested structure. If
   # there is, then outputs is non-flat.
-  if isinstance(outputs, collections_abc.Sequence):
+  if _is_sequence(outputs):
     for o in outputs:
-      if (isinstance(o, collections_abc.Sequence) or
+      if (_is_sequence(o) or
           isinstance(o, collections_abc.Mapping) or
           hasattr(o.__class__, '__attrs_attrs__')):
         return False
@@ -472,30 +561,32 @@ def _postprocess_flat_outputs(outputs):
   if outputs is None:
     outputs = tuple()
   # If the computation only returned one value, make it a tuple.
-  if not isinstance(outputs, collections_abc.Sequence):
+  if not _is_sequence(outputs):
     outputs = (outputs,)
 
   # Append `no_op` here so that return value of this function always contains
   # at least one op that can trigger XlaLaunch node.
   outputs += (control_flow_ops.no_op(),)
-  try:
-    outputs = [
-        o if isinstance(o, ops.Operation) else ops.convert_to_tensor(o)
-        for o in outputs
-    ]
-  except Exception as e:
-    raise ValueError(
-        'XLA computation function return values must all either be Operations'
-        ' or convertible to Tensors. Got error: "%s"' % str(e))
-
-  # Separates the returned Operations and Tensors.
-  output_operations = [o for o in outputs if isinstance(o, ops.Operation)]
-  output_tensors = [o for o in outputs if not isinstance(o, ops.Operation)]
 
-  if outputs != output_tensors + output_operations:
-    raise ValueError(
-        'XLA computation function must return zero or more Tensor values '
-        'followed by zero or more Operations.')
+  # Separates the returned Operations and Tensors in a single pass, checking
+  # that no Tensor follows an Operation.
+  output_tensors = []
+  output_operations = []
+  for o in outputs:
+    if isinstance(o, ops.Operation):
+      output_operations.append(o)
+      continue
+    try:
+      o = ops.convert_to_tensor(o)
+    except Exception as e:
+      raise ValueError(
+          'XLA computation function return values must all either be '
+          'Operations or convertible to Tensors. Got error: "%s"' % str(e))
+    if output_operations:
+      raise ValueError(
+          'XLA computation function must return zero or more Tensor values '
+          'followed by zero or more Operations.')
+    output_tensors.append(o)
 
   new_output_tensors = []
   for t in output_tensors:
@@ -593,6 +684,21 @@ def _get_scaffold(captured_scaffold_fn):
   return scaffold
 
 
+def _get_arg_spec(func):
+  """Returns `tf_inspect.getargspec(func)`, cached when `func` allows it."""
+  try:
+    return _ARG_SPEC_CACHE[func]
+  except (KeyError, TypeError):
+    pass
+  arg_spec = tf_inspect.getargspec(func)
+  try:
+    _ARG_SPEC_CACHE[func] = arg_spec
+  except TypeError:
+    # `func` is not hashable or cannot be weakly referenced.
+    pass
+  return arg_spec
+
+
 def check_function_argument_count(func, input_arity, infeed_queue):
   """Validate the number of input arguments to an XLA function.
 
@@ -614,7 +720,7 @@ def check_function_argument_count(func, input_arity, infeed_queue):
   num_args_supplied = input_arity
   if infeed_queue is not None:
     num_args_supplied += infeed_queue.number_of_tuple_elements
-  arg_spec = tf_inspect.getargspec(func)
+  arg_spec = _get_arg_spec(func)
   num_func_args = len(arg_spec.args)
   if arg_spec.defaults is None:
     num_func_defaults = 0
@@ -14,10 +14,6 @@
 # =============================================================================
 """Tests for python.compiler.xla.xla."""
 
-from __future__ import absolute_import
-from __future__ import division
-from __future__ import print_function
-
 from absl.testing import parameterized
 
 from tensorflow.python import summary
@@ -33,6 +29,7 @@ from tensorflow.python.ops import logging_ops
 from tensorflow.python.ops import math_ops
 from tensorflow.python.ops import state_ops
 from tensorflow.python.ops import variable_scope
+from tensorflow.python.ops import variables
 from tensorflow.python.platform import test
 from tensorflow.python.tpu import tpu_feed
 
@@ -225,6 +222,88 @@ class XlaCompileTest(test.TestCase):
 
     self.assertEqual(self.evaluate(xla.compile(computation, [1, 2])[0]), 3)
 
+  @test_util.run_v2_only
+  def test_xla_compile_eager_creates_variables_on_each_call(self):
+    """Tests that eager xla.compile allows variable creation on every call."""
+
+    def computation(a):
+      v = variables.Variable(2.)
+      return a * v
+
+    self.assertAllEqual(
+        self.evaluate(xla.compile(computation, [constant_op.constant(1.)])[0]),
+        2.)
+    self.assertAllEqual(
+        self.evaluate(
+            xla.compile(computation, [constant_op.constant([1., 2.])])[0]),
+        [2., 4.])
+
+  @test_util.run_v2_only
+  def test_xla_compile_eager_sees_closure_updates(self):
+    """Tests that eager xla.compile retraces closed over Python state."""
+    scale = [1.]
+
+    def computation(a):
+      return a * scale[0]
+
+    self.assertEqual(
+        self.evaluate(xla.compile(computation, [constant_op.constant(3.)])[0]),
+        3.)
+    scale[0] = 2.
+    self.assertEqual(
+        self.evaluate(xla.compile(computation, [constant_op.constant(3.)])[0]),
+        6.)
+
+  @test_util.run_v2_only
+  def test_xla_compile_cached_reuses_trace(self):
+    """Tests that eager xla.compile_cached does not retrace on same inputs."""
+    trace_count = [0]
+
+    def computation(a):
+      trace_count[0] += 1
+      return a + 1
+
+    for value in [1., 2., 3.]:
+      output = xla.compile_cached(computation, [constant_op.constant(value)])
+      self.assertEqual(self.evaluate(output[0]), value + 1)
+    self.assertEqual(trace_count[0], 1)
+
+    self.assertAllEqual(
+        self.evaluate(
+            xla.compile_cached(computation,
+                               [constant_op.constant([1., 2.])])[0]), [2., 3.])
+    self.assertEqual(trace_count[0], 2)
+
+  @test_util.run_v2_only
+  def test_xla_compile_cached_variable_creation_on_retrace(self):
+    """Tests that xla.compile_cached creates variables on first call only."""
+
+    def computation(a):
+      v = variables.Variable(2.)
+      return a * v
+
+    self.assertEqual(
+        self.evaluate(
+            xla.compile_cached(computation, [constant_op.constant(1.)])[0]),
+        2.)
+    with self.assertRaisesRegex(ValueError, 'non-first call'):
+      xla.compile_cached(computation, [constant_op.constant([1., 2.])])
+
+  @test_util.run_v1_only('Testing graph mode behavior only')
+  def test_xla_compile_non_flat_outputs_graph_mode(self):
+    """Tests that non-flat outputs are wrapped in identities in graph mode."""
+
+    def computation(a, b):
+      return {'sum': a + b, 'product': a * b}
+
+    outputs = xla.compile(computation, [1, 2])
+    for output in outputs.values():
+      # The xla_cluster_output ops are removed when the cluster is
+      # encapsulated, so they must not be returned to the caller.
+      self.assertEqual(output.op.type, 'Identity')
+      self.assertEqual(output.op.inputs[0].op.type, 'XlaClusterOutput')
+    self.assertEqual(self.evaluate(outputs), {'sum': 3, 'product': 2})
+
   def test_xla_compile_in_function(self):
     """Tests that xla.compile works in tf.function."""
 
@@ -39,8 +39,10 @@ from tensorflow.python.framework import tensor_shape
 from tensorflow.python.framework import tensor_spec
 from tensorflow.python.framework import test_util
 from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import gen_dataset_ops
 from tensorflow.python.ops import math_ops
 from tensorflow.python.platform import test
+from tensorflow.python.util import nest
 
 
 def _optional_spec_test_combinations():
@@ -173,6 +175,71 @@ class OptionalTest(test_base.DatasetTestBase, parameterized.TestCase):
     with self.assertRaises(errors.InvalidArgumentError):
       self.evaluate(opt.get_value())
 
+  @combinations.generate(test_base.eager_only_combinations())
+  def testEagerHasValueMatchesOp(self):
+    value_structure = tensor_spec.TensorSpec([], dtypes.float32)
+    for opt in [
+        optional_ops.Optional.from_value(constant_op.constant(37.0)),
+        optional_ops.Optional.empty(value_structure)
+    ]:
+      # Optionals created eagerly answer `has_value()` without running the op.
+      with test.mock.patch.object(gen_dataset_ops,
+                                  "optional_has_value") as has_value_op:
+        has_value = opt.has_value()
+      has_value_op.assert_not_called()
+      expected = optional_ops._OptionalImpl(opt._variant_tensor,
+                                            opt.element_spec).has_value()
+      self.assertEqual(expected.dtype, has_value.dtype)
+      self.assertEqual(expected.shape, has_value.shape)
+      self.assertEqual(self.evaluate(expected), self.evaluate(has_value))
+
+  @combinations.generate(test_base.eager_only_combinations())
+  def testEagerGetValueMatchesOp(self):
+    opt = optional_ops.Optional.from_value({
+        "a": constant_op.constant(37.0),
+        "b": (sparse_tensor.SparseTensor(
+            indices=[[0, 1]],
+            values=constant_op.constant([0], dtype=dtypes.int32),
+            dense_shape=[10, 10]), constant_op.constant("Bar"))
+    })
+    # Optionals created eagerly return the wrapped value without running the
+    # op.
+    with test.mock.patch.object(gen_dataset_ops,
+                                "optional_get_value") as get_value_op:
+      value = opt.get_value()
+    get_value_op.assert_not_called()
+    expected = optional_ops._OptionalImpl(opt._variant_tensor,
+                                          opt.element_spec).get_value()
+    self.assertIsInstance(value["b"][0], sparse_tensor.SparseTensor)
+    nest.assert_same_structure(expected, value, expand_composites=True)
+    for expected_component, component in zip(
+        nest.flatten(expected, expand_composites=True),
+        nest.flatten(value, expand_composites=True)):
+      self.assertAllEqual(
+          self.evaluate(expected_component), self.evaluate(component))
+
+  @combinations.generate(test_base.eager_only_combinations())
+  def testEagerGetValueAfterRoundTrip(self):
+    opt = optional_ops.Optional.from_value(constant_op.constant(37.0))
+
+    @def_function.function
+    def get_value(opt):
+      return opt.get_value()
+
+    dataset = dataset_ops.Dataset.from_tensors(opt)
+    round_trip_opt = next(iter(dataset))
+    # Optionals rebuilt from their components don't have the encoded value, so
+    # they have to use the op.
+    self.assertIsNone(round_trip_opt._encoded_value)
+    with test.mock.patch.object(
+        gen_dataset_ops,
+        "optional_get_value",
+        wraps=gen_dataset_ops.optional_get_value) as get_value_op:
+      self.assertEqual(37.0, self.evaluate(round_trip_opt.get_value()))
+      self.assertEqual(1, get_value_op.call_count)
+      self.assertEqual(37.0, self.evaluate(get_value(opt)))
+      self.assertEqual(2, get_value_op.call_count)
+
   @combinations.generate(test_base.default_test_combinations())
   def testAddN(self):
     devices = ["/cpu:0"]
@@ -13,16 +13,12 @@
 # limitations under the License.
 # ==============================================================================
 """A type for representing values that may or may not exist."""
-from __future__ import absolute_import
-from __future__ import division
-from __future__ import print_function
-
 import abc
 
-import six
-
 from tensorflow.python.data.util import structure
+from tensorflow.python.eager import context
 from tensorflow.python.framework import composite_tensor
+from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
 from tensorflow.python.framework import tensor_spec
@@ -31,10 +27,13 @@ from tensorflow.python.ops import gen_dataset_ops
 from tensorflow.python.util import deprecation
 from tensorflow.python.util.tf_export import tf_export
 
+# The component specs of an `Optional`, which decomposes into a single variant
+# tensor.
+_COMPONENT_SPECS = (tensor_spec.TensorSpec((), dtypes.variant),)
+
 
 @tf_export("experimental.Optional", "data.experimental.Optional")
 @deprecation.deprecated_endpoints("data.experimental.Optional")
-@six.add_metaclass(abc.ABCMeta)
 class Optional(composite_tensor.CompositeTensor):
   """Represents a value that may or may not be present.
 
@@ -134,7 +133,10 @@ class Optional(composite_tensor.CompositeTensor):
     Returns:
       A `tf.experimental.Optional` with no value.
     """
-    return _OptionalImpl(gen_dataset_ops.optional_none(), element_spec)
+    return _OptionalImpl(
+        gen_dataset_ops.optional_none(),
+        element_spec,
+        known_has_value=False if context.executing_eagerly() else None)
 
   @staticmethod
   def from_value(value):
@@ -153,6 +155,16 @@ class Optional(composite_tensor.CompositeTensor):
     Returns:
       A `tf.experimental.Optional` that wraps `value`.
     """
+    if context.executing_eagerly():
+      # Name scopes only affect the names of graph ops, so skip them.
+      element_spec = structure.type_spec_from_value(value)
+      encoded_value = structure.to_tensor_list(element_spec, value)
+      return _OptionalImpl(
+          gen_dataset_ops.optional_from_value(encoded_value),
+          element_spec,
+          known_has_value=True,
+          encoded_value=encoded_value)
+
     with ops.name_scope("optional") as scope:
       with ops.name_scope("value"):
         element_spec = structure.type_spec_from_value(value)
@@ -170,28 +182,72 @@ class _OptionalImpl(Optional):
   `Optional.__init__()` in the public API.
   """
 
-  def __init__(self, variant_tensor, element_spec):
+  # `CompositeTensor` does not define `__slots__`, so instances still support
+  # arbitrary attributes, but the per-instance `__dict__` is only allocated if
+  # one is actually set.
+  __slots__ = ["_variant_tensor", "_element_spec", "_flat_types",
+               "_flat_shapes", "_optional_spec", "_known_has_value",
+               "_encoded_value"]
+
+  def __init__(self,
+               variant_tensor,
+               element_spec,
+               known_has_value=None,
+               encoded_value=None):
     self._variant_tensor = variant_tensor
     self._element_spec = element_spec
+    # Whether this optional has a value, if that is known when it is created
+    # eagerly, or `None` otherwise.
+    self._known_has_value = known_has_value
+    # The tensor list encoding of the wrapped value, if this optional was
+    # created eagerly by `from_value()`, or `None` otherwise.
+    self._encoded_value = encoded_value
+    # Flat tensor types and shapes of `element_spec`, computed on first use by
+    # `get_value()`.
+    self._flat_types = None
+    self._flat_shapes = None
+    self._optional_spec = None
+
+  def _compute_flat_types_and_shapes(self):
+    flat_specs = structure.get_flat_tensor_specs(self._element_spec)
+    self._flat_types = [spec.dtype for spec in flat_specs]
+    self._flat_shapes = [spec.shape for spec in flat_specs]
 
   def has_value(self, name=None):
-    with ops.colocate_with(self._variant_tensor):
-      return gen_dataset_ops.optional_has_value(self._variant_tensor, name=name)
+    if self._known_has_value is not None and context.executing_eagerly():
+      return constant_op.constant(self._known_has_value, dtype=dtypes.bool)
+    variant_tensor = self._variant_tensor
+    with ops.colocate_with(variant_tensor):
+      return gen_dataset_ops.optional_has_value(variant_tensor, name=name)
 
   def get_value(self, name=None):
     # TODO(b/110122868): Consolidate the restructuring logic with similar logic
     # in `Iterator.get_next()` and `StructuredFunctionWrapper`.
+    if context.executing_eagerly():
+      if self._encoded_value is not None:
+        # The variant tensor wraps exactly these tensors, so there is no need
+        # to unpack it.
+        return structure.from_tensor_list(self._element_spec,
+                                          self._encoded_value)
+      # Name scopes only affect the names of graph ops, so skip them.
+      return self._get_value(name)
     with ops.name_scope(name, "OptionalGetValue",
                         [self._variant_tensor]) as scope:
-      with ops.colocate_with(self._variant_tensor):
-        result = gen_dataset_ops.optional_get_value(
-            self._variant_tensor,
-            name=scope,
-            output_types=structure.get_flat_tensor_types(self._element_spec),
-            output_shapes=structure.get_flat_tensor_shapes(self._element_spec))
-      # NOTE: We do not colocate the deserialization of composite tensors
-      # because not all ops are guaranteed to have non-GPU kernels.
-      return structure.from_tensor_list(self._element_spec, result)
+      return self._get_value(scope)
+
+  def _get_value(self, name):
+    if self._flat_types is None:
+      self._compute_flat_types_and_shapes()
+    variant_tensor = self._variant_tensor
+    with ops.colocate_with(variant_tensor):
+      result = gen_dataset_ops.optional_get_value(
+          variant_tensor,
+          name=name,
+          output_types=self._flat_types,
+          output_shapes=self._flat_shapes)
+    # NOTE: We do not colocate the deserialization of composite tensors
+    # because not all ops are guaranteed to have non-GPU kernels.
+    return structure.from_tensor_list(self._element_spec, result)
 
   @property
   def element_spec(self):
@@ -199,7 +255,9 @@ class _OptionalImpl(Optional):
 
   @property
   def _type_spec(self):
-    return OptionalSpec.from_value(self)
+    if self._optional_spec is None:
+      self._optional_spec = OptionalSpec.from_value(self)
+    return self._optional_spec
 
 
 @tf_export(
@@ -226,10 +284,11 @@ class OptionalSpec(type_spec.TypeSpec):
       type specification of the optional element.
   """
 
-  __slots__ = ["_element_spec"]
+  __slots__ = ["_element_spec", "_hash"]
 
   def __init__(self, element_spec):
     self._element_spec = element_spec
+    self._hash = None
 
   @property
   def value_type(self):
@@ -238,12 +297,19 @@ class OptionalSpec(type_spec.TypeSpec):
   def _serialize(self):
     return (self._element_spec,)
 
+  def __hash__(self):
+    # Building the comparison key walks the whole element spec, so only do it
+    # once.
+    if self._hash is None:
+      self._hash = super(OptionalSpec, self).__hash__()
+    return self._hash
+
   @property
   def _component_specs(self):
-    return [tensor_spec.TensorSpec((), dtypes.variant)]
+    return _COMPONENT_SPECS
 
   def _to_components(self, value):
-    return [value._variant_tensor]  # pylint: disable=protected-access
+    return (value._variant_tensor,)  # pylint: disable=protected-access
 
   def _from_components(self, flat_value):
     # pylint: disable=protected-access
@@ -18,11 +18,10 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-import copy
+from concurrent import futures
 import threading
-import time
-import weakref
 
+from tensorflow.core.protobuf import config_pb2
 from tensorflow.core.protobuf import rewriter_config_pb2
 from tensorflow.core.protobuf import tensorflow_server_pb2
 from tensorflow.python.distribute import collective_util
@@ -51,6 +50,22 @@ from tensorflow.python.util import deprecation
 from tensorflow.python.util.tf_export import tf_export
 
 
+# Maps (worker_device, num_gpus) to the tuple of local GPU device strings, so
+# that re-initializing a strategy doesn't rebuild them.
+_local_gpu_devices_cache = {}
+
+
+def _local_gpu_devices(worker_device, num_gpus):
+  """Returns the GPU device strings of `worker_device`."""
+  key = (worker_device, num_gpus)
+  local_devices = _local_gpu_devices_cache.get(key)
+  if local_devices is None:
+    local_devices = tuple(
+        "%s/device:GPU:%d" % (worker_device, i) for i in range(num_gpus))
+    _local_gpu_devices_cache[key] = local_devices
+  return local_devices
+
+
 # pylint: disable=line-too-long
 @tf_export("distribute.MultiWorkerMirroredStrategy", v1=[])
 class CollectiveAllReduceStrategy(distribute_lib.Strategy):
@@ -304,6 +319,10 @@ class CollectiveAllReduceExtended(mirrored_strategy.MirroredExtended):
   _enable_check_health = True
   # Check health interval in seconds.
   _check_health_interval = 30
+  # Maximum check health interval in seconds. If it's larger than
+  # `_check_health_interval`, the interval doubles after each check that finds
+  # all peers healthy, up to this value. None keeps the interval fixed.
+  _check_health_interval_max = None
   # Timeout in seconds for the first check health. The first check health needs
   # to wait for cluster, which may make a longer time.
   _check_health_initial_timeout = 0
@@ -314,6 +333,8 @@ class CollectiveAllReduceExtended(mirrored_strategy.MirroredExtended):
 
   def __init__(self, container_strategy, cluster_resolver,
                communication_options):
+    # Set before anything can raise, since __del__ reads it.
+    self._check_health_thread = None
     if not isinstance(communication_options, collective_util.Options):
       raise ValueError("communication_options must be an instance of "
                        "tf.distribute.experimental.CommunicationOptions")
@@ -325,7 +346,6 @@ class CollectiveAllReduceExtended(mirrored_strategy.MirroredExtended):
     self._communication_options = communication_options
     self._collective_key_base = container_strategy._collective_key_base  # pylint: disable=protected-access
     self._initialize_strategy(self._cluster_resolver)
-    self._cfer_fn_cache = weakref.WeakKeyDictionary()
     self.experimental_enable_get_next_as_optional = True
     assert isinstance(self._cross_device_ops,
                       cross_device_ops_lib.CollectiveAllReduce)
@@ -361,7 +381,7 @@ class CollectiveAllReduceExtended(mirrored_strategy.MirroredExtended):
       local_devices = devices
     else:
       if num_gpus:
-        local_devices = tuple("/device:GPU:%d" % i for i in range(num_gpus))
+        local_devices = _local_gpu_devices("", num_gpus)
       else:
         local_devices = ("/device:CPU:0",)
 
@@ -374,13 +394,22 @@ class CollectiveAllReduceExtended(mirrored_strategy.MirroredExtended):
         devices=local_devices,
         group_size=len(local_devices),
         collective_keys=self._collective_keys)
-    # CrossDeviceOps for per host tensors.
-    self._host_cross_device_ops = cross_device_ops_lib.CollectiveAllReduce(
-        devices=[self._worker_device],
-        group_size=self._num_workers,
-        collective_keys=self._collective_keys)
+    # CrossDeviceOps for per host tensors. With a single local device every
+    # value has one component, so `_get_cross_device_ops` always picks
+    # `_cross_device_ops` and a separate instance would never be used.
+    if len(local_devices) == 1:
+      self._host_cross_device_ops = self._cross_device_ops
+    else:
+      self._host_cross_device_ops = cross_device_ops_lib.CollectiveAllReduce(
+          devices=[self._worker_device],
+          group_size=self._num_workers,
+          collective_keys=self._collective_keys)
     super(CollectiveAllReduceExtended, self)._initialize_single_worker(
         local_devices)
+    self._input_workers_cache = {}
+    self._input_context = None
+    self._num_local_devices = len(local_devices)
+    self._cached_num_replicas_in_sync = len(local_devices) * self._num_workers
 
     self._cluster_spec = None
     self._task_type = None
@@ -417,6 +446,12 @@ class CollectiveAllReduceExtended(mirrored_strategy.MirroredExtended):
     self._task_id = task_id
     self._id_in_cluster = multi_worker_util.id_in_cluster(
         self._cluster_spec, self._task_type, self._task_id)
+    # The peers checked by `_check_health`. The cluster doesn't change after
+    # initialization, so the names are only built once.
+    self._peer_names = tuple(
+        "/job:{}/replica:0/task:{}".format(job, task_id)
+        for job in cluster_spec.jobs
+        for task_id in range(cluster_spec.num_tasks(job)))
 
     self._num_workers = multi_worker_util.worker_count(cluster_spec, task_type)
     if not self._num_workers:
@@ -435,7 +470,7 @@ class CollectiveAllReduceExtended(mirrored_strategy.MirroredExtended):
           collective_leader=multi_worker_util.collective_leader(
               cluster_spec, task_type, task_id),
           scoped_allocator_enabled_ops=("CollectiveReduce",),
-          device_filters=("/job:%s/task:%d" % (task_type, task_id),))
+          device_filters=(self._worker_device,))
       self._collective_ops_configured = True
 
     # Starting a std server in eager mode and in independent worker mode.
@@ -444,8 +479,9 @@ class CollectiveAllReduceExtended(mirrored_strategy.MirroredExtended):
         not getattr(self, "_local_or_standalone_client_mode", False)):
       # Checking _local_or_standalone_client_mode as well because we should not
       # create the std server in standalone client mode.
-      config_proto = copy.deepcopy(context.context().config)
-      config_proto = self._update_config_proto(config_proto)
+      # `context.context().config` returns a new proto, and
+      # `_update_config_proto` copies it again, so there is no need to copy.
+      config_proto = self._update_config_proto(context.context().config)
 
       if hasattr(cluster_resolver, "port"):
         port = cluster_resolver.port
@@ -478,8 +514,7 @@ class CollectiveAllReduceExtended(mirrored_strategy.MirroredExtended):
       num_gpus = cluster_resolver.num_accelerators().get("GPU", 0)
 
     if num_gpus:
-      local_devices = tuple("%s/device:GPU:%d" % (self._worker_device, i)
-                            for i in range(num_gpus))
+      local_devices = _local_gpu_devices(self._worker_device, num_gpus)
     else:
       local_devices = (self._worker_device,)
 
@@ -496,10 +531,14 @@ class CollectiveAllReduceExtended(mirrored_strategy.MirroredExtended):
         collective_keys=self._collective_keys)
     super(CollectiveAllReduceExtended, self)._initialize_single_worker(
         local_devices)
+    self._input_workers_cache = {}
+    self._input_context = None
+    self._num_local_devices = len(local_devices)
+    self._cached_num_replicas_in_sync = len(local_devices) * self._num_workers
 
     # Add a default device so that ops without specified devices will not end up
     # on other workers.
-    self._default_device = "/job:%s/task:%d" % (task_type, task_id)
+    self._default_device = self._worker_device
 
     # Save the num_gpus_per_worker and rpc_layer for configure method.
     self._num_gpus_per_worker = num_gpus
@@ -520,14 +559,23 @@ class CollectiveAllReduceExtended(mirrored_strategy.MirroredExtended):
     self._stop_check_health_thread()
 
   def _input_workers_with_options(self, options=None):
-    host_device = device_util.get_host_for_device(self._worker_device)
-    if not options or options.experimental_prefetch_to_device:
-      return input_lib.InputWorkers([(host_device, self.worker_devices)])
-    else:
-      return input_lib.InputWorkers([(
-          host_device,
-          [device_util.get_host_for_device(worker) for worker in
-           self.worker_devices])])
+    prefetch_to_device = bool(
+        not options or options.experimental_prefetch_to_device)
+    # `InputWorkers` only depends on the devices, which are fixed until the
+    # strategy is re-initialized, so build each variant once.
+    input_workers = self._input_workers_cache.get(prefetch_to_device)
+    if input_workers is None:
+      host_device = device_util.get_host_for_device(self._worker_device)
+      if prefetch_to_device:
+        input_workers = input_lib.InputWorkers(
+            [(host_device, self.worker_devices)])
+      else:
+        input_workers = input_lib.InputWorkers([(
+            host_device,
+            [device_util.get_host_for_device(worker) for worker in
+             self.worker_devices])])
+      self._input_workers_cache[prefetch_to_device] = input_workers
+    return input_workers
 
   @property
   def _input_workers(self):
@@ -583,11 +631,14 @@ class CollectiveAllReduceExtended(mirrored_strategy.MirroredExtended):
                        **kwargs)
 
   def _make_input_context(self):
-    input_context = distribute_lib.InputContext(
-        num_input_pipelines=self._num_workers,
-        input_pipeline_id=self._id_in_cluster,
-        num_replicas_in_sync=self._num_replicas_in_sync)
-    return input_context
+    # `InputContext` is immutable and only depends on the cluster, so it's
+    # shared by all datasets until the strategy is re-initialized.
+    if self._input_context is None:
+      self._input_context = distribute_lib.InputContext(
+          num_input_pipelines=self._num_workers,
+          input_pipeline_id=self._id_in_cluster,
+          num_replicas_in_sync=self._num_replicas_in_sync)
+    return self._input_context
 
   def _experimental_distribute_dataset(self, dataset, options):
     if (options and options.experimental_replication_mode ==
@@ -621,14 +672,14 @@ class CollectiveAllReduceExtended(mirrored_strategy.MirroredExtended):
         strategy=self._container_strategy())
 
   def _experimental_distribute_values_from_function(self, value_fn):
-    per_replica_values = []
-    num_local_replicas = len(self.worker_devices)
-    for local_replica_id in range(num_local_replicas):
-      replica_id = (self._id_in_cluster * num_local_replicas +
-                    local_replica_id)
-      value_context = distribute_lib.ValueContext(
-          replica_id, self._num_replicas_in_sync)
-      per_replica_values.append(value_fn(value_context))
+    num_local_replicas = self._num_local_devices
+    first_replica_id = self._id_in_cluster * num_local_replicas
+    num_replicas_in_sync = self._num_replicas_in_sync
+    per_replica_values = [
+        value_fn(distribute_lib.ValueContext(
+            first_replica_id + local_replica_id, num_replicas_in_sync))
+        for local_replica_id in range(num_local_replicas)
+    ]
     return distribute_utils.regroup(per_replica_values, always_wrap=True)
 
   def _make_dataset_iterator(self, dataset):
@@ -685,7 +736,8 @@ class CollectiveAllReduceExtended(mirrored_strategy.MirroredExtended):
       session_config.CopyFrom(self._update_config_proto(session_config))
 
   def _update_config_proto(self, config_proto):
-    updated_config = copy.deepcopy(config_proto)
+    updated_config = config_pb2.ConfigProto()
+    updated_config.CopyFrom(config_proto)
     # Enable the scoped allocator optimization for CollectiveOps.  This
     # optimization converts many small all-reduces into fewer larger
     # all-reduces.
@@ -717,8 +769,7 @@ class CollectiveAllReduceExtended(mirrored_strategy.MirroredExtended):
 
     # The device filters prevent communication between workers.
     del updated_config.device_filters[:]
-    updated_config.device_filters.append(
-        "/job:%s/task:%d" % (self._task_type, self._task_id))
+    updated_config.device_filters.append(self._worker_device)
 
     return updated_config
 
@@ -733,7 +784,7 @@ class CollectiveAllReduceExtended(mirrored_strategy.MirroredExtended):
       num_devices = len(value._values)  # pylint: disable=protected-access
     else:
       num_devices = 1
-    if num_devices == len(self.worker_devices):
+    if num_devices == self._num_local_devices:
       return self._cross_device_ops
     else:
       return self._host_cross_device_ops
@@ -771,51 +822,97 @@ class CollectiveAllReduceExtended(mirrored_strategy.MirroredExtended):
         destinations=destinations,
         options=self._communication_options.merge(options))
 
+  def _check_peer_health(self, peer):
+    """Checks whether `peer` is reachable, retrying on failures.
+
+    Args:
+      peer: the name of the task to check, e.g. "/job:worker/replica:0/task:0".
+
+    Returns:
+      None if `peer` is healthy, otherwise an `(error_code, message)` tuple to
+      abort collectives with.
+    """
+    attempts = 0
+    while True:
+      attempts += 1
+      try:
+        context.context().check_collective_ops_peer_health(
+            peer, timeout_in_ms=self._check_health_timeout * 1000)
+        # If check_collective_ops_peer_health doesn't raise an Exception,
+        # the peer is healthy.
+        return None
+      except (errors.UnavailableError, errors.FailedPreconditionError,
+              errors.DeadlineExceededError) as e:
+        # TODO(b/151232436): Always raise UnavailableError when a peer
+        # fails. Now there could be many kinds of errors:
+        # - Unavailable: when the peer is not reachable, e.g. it's down.
+        # - FailedPrecondition: when the peer has restarted.
+        if attempts < self._check_health_retry_limit:
+          logging.warning("%s seems down, retrying %d/%d", peer, attempts,
+                          self._check_health_retry_limit)
+          continue
+        logging.error(
+            "Cluster check alive failed, %s is down, "
+            "aborting collectives: %s", peer, e)
+        return (errors.UNAVAILABLE,
+                "cluster check alive failed, {} is down".format(peer))
+      except Exception as e:  # pylint: disable=broad-except
+        logging.error("Unexpected exception in check alive: %s", e)
+        return (errors.INTERNAL,
+                "unexecpted exception in check alive: %s" % e)
+
   def _check_health(self):
+    # Keep a reference, since _stop_check_health_thread may reset the attribute
+    # while this thread is still finishing a check.
+    executor = self._check_health_executor
+    interval = self._check_health_interval
     while True:
       if self._check_health_thread_should_stop.is_set():
         return
-      for job in self._cluster_spec.jobs:
-        for task_id in range(self._cluster_spec.num_tasks(job)):
-          peer = "/job:{}/replica:0/task:{}".format(job, task_id)
-          attempts = 0
-          while True:
-            attempts += 1
-            try:
-              context.context().check_collective_ops_peer_health(
-                  peer, timeout_in_ms=self._check_health_timeout * 1000)
-              # If check_collective_ops_peer_health doesn't raise an Exception,
-              # the peer is healthy.
-              break
-            except (errors.UnavailableError, errors.FailedPreconditionError,
-                    errors.DeadlineExceededError) as e:
-              # TODO(b/151232436): Always raise UnavailableError when a peer
-              # fails. Now there could be many kinds of errors:
-              # - Unavailable: when the peer is not reachable, e.g. it's down.
-              # - FailedPrecondition: when the peer has restarted.
-              if attempts < self._check_health_retry_limit:
-                logging.warning("%s seems down, retrying %d/%d", peer, attempts,
-                                self._check_health_retry_limit)
-                continue
-              logging.error(
-                  "Cluster check alive failed, %s is down, "
-                  "aborting collectives: %s", peer, e)
-              context.context().abort_collective_ops(
-                  errors.UNAVAILABLE,
-                  "cluster check alive failed, {} is down".format(peer))
-              return
-            except Exception as e:  # pylint: disable=broad-except
-              logging.error("Unexpected exception in check alive: %s", e)
-              context.context().abort_collective_ops(
-                  errors.INTERNAL,
-                  "unexecpted exception in check alive: %s" % e)
-              return
-      time.sleep(self._check_health_interval)
+      # Check all peers concurrently so that a slow peer doesn't delay the
+      # detection of another one that is down.
+      try:
+        pending = [
+            executor.submit(self._check_peer_health, peer)
+            for peer in self._peer_names
+        ]
+      except RuntimeError:
+        # The executor has been shut down by _stop_check_health_thread.
+        return
+      for future in futures.as_completed(pending):
+        try:
+          error = future.result()
+        except BaseException as e:  # pylint: disable=broad-except
+          logging.error("Unexpected exception in check alive: %s", e)
+          error = (errors.INTERNAL,
+                   "unexpected exception in check alive: %s" % e)
+        if error is not None:
+          # The stop request may have timed out waiting for this check. Don't
+          # abort collectives on behalf of a strategy that has been stopped,
+          # since that would affect collectives of later strategies too.
+          if self._check_health_thread_should_stop.is_set():
+            return
+          context.context().abort_collective_ops(*error)
+          return
+      # Wait for the next check, waking up immediately if asked to stop.
+      if self._check_health_thread_should_stop.wait(interval):
+        return
+      if (self._check_health_interval_max is not None and
+          interval < self._check_health_interval_max):
+        interval = min(interval * 2, self._check_health_interval_max)
 
-  def _start_check_health_thread(self):
-    if not context.executing_eagerly():
-      logging.info("Check health is only supported in eager.")
-      return
+  def _wait_for_cluster(self):
+    """Blocks until all workers are up.
+
+    This must run on the thread that creates the strategy, before it launches
+    any other collective. The barrier takes an instance key from the shared
+    `CollectiveKeys`, so it has to be launched in the same order on every
+    worker.
+
+    Raises:
+      RuntimeError: if the cluster isn't ready within
+        `_check_health_initial_timeout` seconds.
+    """
     # Use a dummy all-reduce as a barrier to wait for all workers to be up,
     # otherwise the check health may fail immediately.
 
@@ -842,7 +939,18 @@ class CollectiveAllReduceExtended(mirrored_strategy.MirroredExtended):
           "Timeout waiting for the cluster, timeout is %d seconds" %
           self._check_health_initial_timeout)
     logging.info("Cluster is ready.")
+
+  def _start_check_health_thread(self):
+    if not context.executing_eagerly():
+      logging.info("Check health is only supported in eager.")
+      return
+    self._wait_for_cluster()
     self._check_health_thread_should_stop = threading.Event()
+    # Peers are checked in a bounded pool that is reused across checks, so a
+    # large cluster doesn't start a thread per peer on every check.
+    self._check_health_executor = futures.ThreadPoolExecutor(
+        max_workers=max(1, min(32, len(self._peer_names))),
+        thread_name_prefix="check_health")
     # Start the thread as daemon to avoid it blocking the program from exiting.
     # We try best to shutdown the thread but __del__ is not guaranteed to be
     # called when program exists.
@@ -852,12 +960,23 @@ class CollectiveAllReduceExtended(mirrored_strategy.MirroredExtended):
     self._check_health_thread.start()
 
   def _stop_check_health_thread(self):
-    if getattr(self, "_check_health_thread", None):
+    if self._check_health_thread is not None:
       logging.info("stopping check health thread")
       self._check_health_thread_should_stop.set()
-      self._check_health_thread.join()
+      # The thread wakes up as soon as the event is set, unless it's in the
+      # middle of checking peers. Don't block on that for longer than one check
+      # timeout; the thread is a daemon, so a late exit doesn't hold up the
+      # program.
+      self._check_health_thread.join(self._check_health_timeout)
+      if self._check_health_thread.is_alive():
+        logging.info("check health thread is still finishing a check")
+      else:
+        logging.info("check health thread stopped")
       self._check_health_thread = None
-      logging.info("check health thread stopped")
+      # Don't wait for checks that are still running, they are bounded by
+      # `_check_health_timeout` and their results are ignored after the stop.
+      self._check_health_executor.shutdown(wait=False)
+      self._check_health_executor = None
 
   def _warn_nccl_no_gpu(self):
     if ((self._communication_options.implementation ==
@@ -888,7 +1007,7 @@ class CollectiveAllReduceExtended(mirrored_strategy.MirroredExtended):
 
   @property
   def _num_replicas_in_sync(self):
-    return len(self.worker_devices) * self._num_workers
+    return self._cached_num_replicas_in_sync
 
   # TODO(priyag): Delete this once all strategies use global batch size.
   @property
@@ -18,7 +18,9 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from concurrent import futures
 import functools
+import threading
 
 from absl.testing import parameterized
 import numpy as np
@@ -28,6 +30,7 @@ from tensorflow.core.protobuf import rewriter_config_pb2
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.distribute import cluster_resolver as cluster_resolver_lib
 from tensorflow.python.distribute import collective_all_reduce_strategy
+from tensorflow.python.distribute import collective_util
 from tensorflow.python.distribute import combinations
 from tensorflow.python.distribute import distribute_lib
 from tensorflow.python.distribute import distribute_utils
@@ -400,6 +403,20 @@ class DistributedCollectiveAllReduceStrategyTest(
     self.assertEqual(['CollectiveReduce'],
                      new_rewrite_options.scoped_allocator_opts.enable_op)
 
+  @combinations.generate(combinations.combine(mode=['graph']))
+  def testUpdateConfigProtoKeepsAutoCommunication(self):
+    strategy, _, _ = self._get_test_object(
+        task_type='worker', task_id=1, num_gpus=2)
+
+    # AUTO must not be resolved to NCCL up front: collective_nccl would make the
+    # runtime use NCCL for all collectives, including the single tensor ones
+    # that are launched with AUTO since NCCL launches can't be ordered.
+    self.assertEqual(
+        collective_util.CommunicationImplementation.AUTO,
+        strategy.extended._communication_options.implementation)
+    new_config = strategy.update_config_proto(config_pb2.ConfigProto())
+    self.assertFalse(new_config.experimental.collective_nccl)
+
   def _get_strategy_with_mocked_methods(self):
     mock_called = [False]
 
@@ -588,6 +605,103 @@ class LogicalDeviceTest(test.TestCase, parameterized.TestCase):
     context._reset_context()  # pylint: disable=protected-access
 
 
+class _FakeStopEvent(object):
+  """Records the check health waits, and stops after `num_waits` of them."""
+
+  def __init__(self, num_waits):
+    self.waits = []
+    self._num_waits = num_waits
+
+  def is_set(self):
+    return len(self.waits) >= self._num_waits
+
+  def wait(self, timeout):
+    self.waits.append(timeout)
+    return self.is_set()
+
+
+class CheckHealthTest(test.TestCase):
+
+  def _create_extended(self,
+                       check_peer_health,
+                       peer_names=('/job:worker/replica:0/task:1',)):
+    strategy, _, _ = create_test_objects(num_gpus=0)
+    extended = strategy.extended
+    extended._peer_names = list(peer_names)
+    extended._check_peer_health = check_peer_health
+    extended._check_health_thread_should_stop = threading.Event()
+    extended._check_health_executor = futures.ThreadPoolExecutor(
+        max_workers=len(peer_names))
+    self.addCleanup(extended._check_health_executor.shutdown)
+    return extended
+
+  def testAbortWhenPeerIsDown(self):
+    extended = self._create_extended(
+        lambda peer: (errors.UNAVAILABLE, 'peer is down'))
+    with test.mock.patch.object(context.context(),
+                                'abort_collective_ops') as abort:
+      extended._check_health()
+    abort.assert_called_once_with(errors.UNAVAILABLE, 'peer is down')
+
+  def testNoAbortAfterStop(self):
+
+    def check_peer_health(peer):
+      del peer
+      # The stop request arrives while the peer is being checked.
+      extended._check_health_thread_should_stop.set()
+      return (errors.UNAVAILABLE, 'peer is down')
+
+    extended = self._create_extended(check_peer_health)
+    with test.mock.patch.object(context.context(),
+                                'abort_collective_ops') as abort:
+      extended._check_health()
+    abort.assert_not_called()
+
+  def testCheckPeersConcurrently(self):
+    # Only returns if both healthy peers are checked at the same time.
+    barrier = threading.Barrier(2, timeout=10)
+    checked = []
+
+    def check_peer_health(peer):
+      if peer.endswith('task:3'):
+        raise ValueError('unexpected error')
+      barrier.wait()
+      checked.append(peer)
+      return None
+
+    extended = self._create_extended(
+        check_peer_health,
+        peer_names=[
+            '/job:worker/replica:0/task:1', '/job:worker/replica:0/task:2',
+            '/job:worker/replica:0/task:3'
+        ])
+    with test.mock.patch.object(context.context(),
+                                'abort_collective_ops') as abort:
+      extended._check_health()
+    abort.assert_called_once()
+    self.assertEqual(errors.INTERNAL, abort.call_args[0][0])
+    extended._check_health_executor.shutdown(wait=True)
+    self.assertCountEqual(
+        ['/job:worker/replica:0/task:1', '/job:worker/replica:0/task:2'],
+        checked)
+
+  def testIntervalIsFixedByDefault(self):
+    extended = self._create_extended(lambda peer: None)
+    extended._check_health_interval = 1
+    extended._check_health_thread_should_stop = _FakeStopEvent(num_waits=3)
+    extended._check_health()
+    self.assertEqual([1, 1, 1], extended._check_health_thread_should_stop.waits)
+
+  def testIntervalBacksOffToMax(self):
+    extended = self._create_extended(lambda peer: None)
+    extended._check_health_interval = 1
+    extended._check_health_interval_max = 8
+    extended._check_health_thread_should_stop = _FakeStopEvent(num_waits=6)
+    extended._check_health()
+    self.assertEqual([1, 2, 4, 8, 8, 8],
+                     extended._check_health_thread_should_stop.waits)
+
+
 @combinations.generate(
     combinations.combine(
         strategy=[
@@ -19,7 +19,6 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-import copy
 import enum
 
 from tensorflow.python.util import deprecation
@@ -121,6 +120,11 @@ class _OptionsExported(object):
 class Options(object):
   """Implementation of OptionsInterface."""
 
+  # An Options is created for most collective calls, so avoid a per instance
+  # __dict__. `__weakref__` keeps instances usable as `tf.function` arguments.
+  __slots__ = ("bytes_per_pack", "timeout_seconds", "implementation",
+               "__weakref__")
+
   def __init__(self,
                bytes_per_pack=0,
                timeout_seconds=None,
@@ -132,12 +136,40 @@ class Options(object):
     if not isinstance(implementation, CommunicationImplementation):
       raise ValueError("implementation should be a "
                        "tf.distribute.experimental.CommunicationImplementation")
-    self.bytes_per_pack = bytes_per_pack
-    self.timeout_seconds = timeout_seconds
-    self.implementation = implementation
+    # Options are immutable so that they can be hashed by value.
+    object.__setattr__(self, "bytes_per_pack", bytes_per_pack)
+    object.__setattr__(self, "timeout_seconds", timeout_seconds)
+    object.__setattr__(self, "implementation", implementation)
 
   __init__.__doc__ = _OptionsExported.__init__.__doc__
 
+  def __setattr__(self, name, value):
+    raise AttributeError("Options are immutable, use merge() to create a new "
+                         "one with different values")
+
+  def __delattr__(self, name):
+    raise AttributeError("Options are immutable")
+
+  def __reduce__(self):
+    return Options, self._key()
+
+  def _key(self):
+    return (self.bytes_per_pack, self.timeout_seconds, self.implementation)
+
+  def __eq__(self, other):
+    if not isinstance(other, Options):
+      return NotImplemented
+    return self._key() == other._key()  # pylint: disable=protected-access
+
+  def __ne__(self, other):
+    result = self.__eq__(other)
+    if result is NotImplemented:
+      return result
+    return not result
+
+  def __hash__(self):
+    return hash(self._key())
+
   def merge(self, options):
     """Merges with another options and returns a new one.
 
@@ -148,18 +180,24 @@ class Options(object):
       options: a `tf.distribute.experimental.CollectiveCommunication`.
 
     Returns:
-      A new `tf.distribute.experimental.CollectiveCommunication`.
+      A new `tf.distribute.experimental.CollectiveCommunication`, or this one if
+      `options` is None.
     """
-    merged = copy.deepcopy(self)
     if options is None:
-      return merged
+      return self
+    bytes_per_pack = self.bytes_per_pack
+    timeout_seconds = self.timeout_seconds
+    implementation = self.implementation
     if options.bytes_per_pack != 0:
-      merged.bytes_per_pack = options.bytes_per_pack
+      bytes_per_pack = options.bytes_per_pack
     if options.timeout_seconds is not None:
-      merged.timeout_seconds = options.timeout_seconds
+      timeout_seconds = options.timeout_seconds
     if options.implementation != CommunicationImplementation.AUTO:
-      merged.implementation = options.implementation
-    return merged
+      implementation = options.implementation
+    return Options(
+        bytes_per_pack=bytes_per_pack,
+        timeout_seconds=timeout_seconds,
+        implementation=implementation)
 
 
 @tf_export("distribute.experimental.CollectiveHints")
@@ -19,7 +19,9 @@ from __future__ import division
 from __future__ import print_function
 
 from tensorflow.python.distribute import collective_util
+from tensorflow.python.eager import def_function
 from tensorflow.python.eager import test
+from tensorflow.python.framework import constant_op
 
 
 class OptionsTest(test.TestCase):
@@ -39,6 +41,41 @@ class OptionsTest(test.TestCase):
     self.assertEqual(options.bytes_per_pack, 50)
     self.assertEqual(options.timeout_seconds, 1)
 
+  def testOptionsEquality(self):
+    options = collective_util.Options(bytes_per_pack=1, timeout_seconds=2)
+    same = collective_util.Options(bytes_per_pack=1, timeout_seconds=2)
+    self.assertEqual(options, same)
+    self.assertNotEqual(options, collective_util.Options(bytes_per_pack=1))
+    self.assertFalse(hasattr(options, "__dict__"))
+
+  def testOptionsAreImmutableAndHashable(self):
+    options = collective_util.Options(bytes_per_pack=1, timeout_seconds=2)
+    same = collective_util.Options(bytes_per_pack=1, timeout_seconds=2)
+    self.assertEqual(hash(options), hash(same))
+    with self.assertRaises(AttributeError):
+      options.bytes_per_pack = 2
+    self.assertEqual(options.bytes_per_pack, 1)
+
+  def testOptionsAsFunctionArgument(self):
+    trace_count = [0]
+
+    @def_function.function
+    def f(x, options):
+      trace_count[0] += 1
+      return x + options.bytes_per_pack
+
+    options = collective_util.Options(bytes_per_pack=1)
+    self.assertEqual(self.evaluate(f(constant_op.constant(1), options)), 2)
+    self.assertEqual(self.evaluate(f(constant_op.constant(2), options)), 3)
+    self.assertEqual(trace_count[0], 1)
+
+  def testMergeDoesNotModifyOriginal(self):
+    options = collective_util.Options(bytes_per_pack=1)
+    merged = options.merge(collective_util.Options(timeout_seconds=2))
+    self.assertEqual(
+        merged, collective_util.Options(bytes_per_pack=1, timeout_seconds=2))
+    self.assertIsNone(options.timeout_seconds)
+
 
 if __name__ == "__main__":
   test.main()
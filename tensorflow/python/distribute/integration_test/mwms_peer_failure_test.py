@@ -23,6 +23,7 @@ from __future__ import division
 from __future__ import print_function
 
 import os
+import sys
 
 import tensorflow as tf
 
@@ -44,11 +45,21 @@ mwms_lib.CollectiveAllReduceExtended._check_health_timeout = 1
 def get_attempt(strategy, attempts):
   task_type = strategy.cluster_resolver.task_type
   task_id = strategy.cluster_resolver.task_id
-  attempts[(task_type, task_id)] = attempts.get((task_type, task_id), 0) + 1
-  return task_id, attempts[(task_type, task_id)]
-
-
-quick_exit = os._exit  # pylint: disable=protected-access
+  # Each key is only written by the worker it belongs to, and a restarted
+  # worker only starts after the previous attempt exits, so there's no race.
+  # Keep the result locally instead of reading it back from the manager.
+  attempt = attempts.get((task_type, task_id), 0) + 1
+  attempts[(task_type, task_id)] = attempt
+  return task_id, attempt
+
+
+def quick_exit(code):
+  # Skip atexit handlers and interpreter teardown, which may block on
+  # collectives that will never complete, but flush the output first so that
+  # the logs of the failing worker aren't lost.
+  sys.stdout.flush()
+  sys.stderr.flush()
+  os._exit(code)  # pylint: disable=protected-access
 
 
 class PeerFailureTest(test.TestCase):
@@ -76,15 +76,55 @@ def get_tpu_cluster_resolver():
   return resolver
 
 
+# Connecting to the cluster and initializing the TPU system are expensive, and
+# the result is the same for every test, so they are only done once.
+_resolver = None
+_topology = None
+
+
+def connect_and_initialize_tpu_system():
+  """Returns the cluster resolver and topology of the initialized TPU system."""
+  global _resolver, _topology
+  if _topology is None:
+    resolver = get_tpu_cluster_resolver()
+    remote.connect_to_cluster(resolver)
+    _topology = tpu_strategy_util.initialize_tpu_system(resolver)
+    _resolver = resolver
+  return _resolver, _topology
+
+
 def get_tpu_strategy(enable_packed_var=False):
-  resolver = get_tpu_cluster_resolver()
-  remote.connect_to_cluster(resolver)
-  tpu_strategy_util.initialize_tpu_system(resolver)
+  resolver, _ = connect_and_initialize_tpu_system()
   strategy = tpu_lib.TPUStrategyV2(resolver)
   strategy._enable_packed_variable_in_eager_mode = enable_packed_var
   return strategy
 
 
+def _create_table_and_sparse_dataset(strategy):
+  """Returns a lookup table and an iterator of identical `SparseTensor`s."""
+  with strategy.scope():
+    table = variables.Variable(
+        initial_value=[[0.0, 1.0], [3.0, 7.0]], dtype=dtypes.float32)
+
+  def dataset_fn(_):
+    dataset = dataset_ops.Dataset.range(2)
+
+    def make_sparse(_):
+      return sparse_tensor.SparseTensor(
+          indices=array_ops.constant([[0, 0], [1, 0], [1, 1]],
+                                     dtype=dtypes.int64),
+          values=array_ops.constant([0, 0, 1], dtype=dtypes.int32),
+          dense_shape=array_ops.constant([2, 2], dtype=dtypes.int64))
+
+    return dataset.map(make_sparse)
+
+  dataset = iter(
+      strategy.distribute_datasets_from_function(
+          dataset_fn,
+          distribute_lib.InputOptions(experimental_prefetch_to_device=False)))
+  return table, dataset
+
+
 # TPU tests which don't use TPUStrategy.
 class TPUTest(test.TestCase):
 
@@ -179,36 +219,6 @@ class TPUStrategyTest(test.TestCase, parameterized.TestCase):
     with ops.device("/device:TPU:0"):
       self.assertAllEqual(func(), 2.0)
 
-  def test_sequential_runs(self, enable_packed_var):
-    resolver = get_tpu_cluster_resolver()
-    remote.connect_to_cluster(resolver)
-    topology = tpu_strategy_util.initialize_tpu_system(resolver)
-    # Computation replicated to all cores.
-    device_assignment = device_assignment_lib.DeviceAssignment.build(
-        topology, num_replicas=2)
-    strategy = tpu_lib.TPUStrategyV2(
-        resolver, experimental_device_assignment=device_assignment)
-    strategy._enable_packed_variable_in_eager_mode = enable_packed_var
-
-    # Computation on the 1st core.
-    device_assignment2 = device_assignment_lib.DeviceAssignment.build(
-        topology, num_replicas=1)
-    strategy2 = tpu_lib.TPUStrategyV2(
-        resolver, experimental_device_assignment=device_assignment2)
-
-    def computation(x):
-      return math_ops.square(x)
-
-    @def_function.function
-    def train_step():
-      outputs = strategy.experimental_local_results(
-          strategy.run(computation, args=([2., 2.],)))
-      outputs2 = strategy2.run(
-          computation, args=([outputs[0]],))
-      return outputs2
-
-    self.assertAllEqual([[16., 16.]], train_step())
-
   def test_device_switch_case(self, enable_packed_var):
     strategy = get_tpu_strategy(enable_packed_var)
     with strategy.scope():
@@ -236,64 +246,8 @@ class TPUStrategyTest(test.TestCase, parameterized.TestCase):
     self.assertAllEqual(2., run_inference(1))  # Use TPU core 0.
     self.assertAllEqual(3., run_inference(1))  # Use TPU core 1.
 
-  def test_recover_from_compilation_failures(self, enable_packed_var):
-    # TODO(b/148150981): Stop skipping this test once recovery works
-    # for non-local TPU.
-    if FLAGS.tpu:
-      self.skipTest("Recovery fails for non-local TPU, see b/148150981")
-
-    # Disable automatic outside compilation.
-    config.set_soft_device_placement(False)
-    strategy = get_tpu_strategy(enable_packed_var)
-
-    @def_function.function
-    def compilation_failure_run():
-
-      def computation():
-        return random_ops.random_gamma([10], [0.5, 1.5])
-
-      return strategy.run(computation)
-
-    with self.assertRaises(errors.OpError):
-      compilation_failure_run()
-
-    @def_function.function
-    def good_run():
-
-      def computation():
-        return random_ops.random_normal([10])
-
-      return strategy.run(computation)
-
-    good_run()
-
-  def test_dynamic_shape_with_outside_compilation_failure(
-      self, enable_packed_var):
-    # Enable automatic outside compilation.
-    config.set_soft_device_placement(True)
-    strategy = get_tpu_strategy(enable_packed_var)
-    dataset = dataset_ops.Dataset.from_tensors(("string", 1.0)).repeat().batch(
-        2, drop_remainder=False)
-    dataset = strategy.experimental_distribute_dataset(dataset)
-    iterator = iter(dataset)
-
-    @def_function.function
-    def train_fn(iterator):
-
-      def step_fn(inputs):
-        _, inputs = inputs
-        return math_ops.reduce_sum(inputs)
-
-      return strategy.experimental_local_results(
-          strategy.run(step_fn, args=(next(iterator),)))
-
-    with self.assertRaisesRegex(errors.InternalError, "Compilation failure"):
-      logging.info(train_fn(iterator))
-
   def test_computation_on_subset_cores(self, enable_packed_var):
-    resolver = get_tpu_cluster_resolver()
-    remote.connect_to_cluster(resolver)
-    topology = tpu_strategy_util.initialize_tpu_system(resolver)
+    resolver, topology = connect_and_initialize_tpu_system()
     all_core_strategy = tpu_lib.TPUStrategyV2(resolver)
     all_core_strategy._enable_packed_variable_in_eager_mode = enable_packed_var
 
@@ -331,35 +285,6 @@ class TPUStrategyTest(test.TestCase, parameterized.TestCase):
     train_step()
     self.assertAllEqual(2., train_step())
 
-  def test_worker_devices_on_subset_cores(self, enable_packed_var):
-    resolver = get_tpu_cluster_resolver()
-    remote.connect_to_cluster(resolver)
-    topology = tpu_strategy_util.initialize_tpu_system(resolver)
-
-    # Strategy for the 1st core.
-    device_assignment = device_assignment_lib.DeviceAssignment.build(
-        topology, num_replicas=1)
-    first_core_strategy = tpu_lib.TPUStrategyV2(
-        resolver, experimental_device_assignment=device_assignment)
-    first_core_strategy._enable_packed_variable_in_eager_mode = (
-        enable_packed_var)
-
-    # Strategy for the 2nd core.
-    device_assignment2 = device_assignment_lib.DeviceAssignment(
-        topology, [[[0, 0, 0, 1]]])
-    second_core_strategy = tpu_lib.TPUStrategyV2(
-        resolver, experimental_device_assignment=device_assignment2)
-    second_core_strategy._enable_packed_variable_in_eager_mode = (
-        enable_packed_var)
-
-    self.assertLen(first_core_strategy.extended.worker_devices, 1)
-    self.assertEndsWith(first_core_strategy.extended.worker_devices[0],
-                        "device:TPU:0")
-
-    self.assertLen(second_core_strategy.extended.worker_devices, 1)
-    self.assertEndsWith(second_core_strategy.extended.worker_devices[0],
-                        "device:TPU:1")
-
   def test_control_output_in_while_body_fn(self, enable_packed_var):
     strategy = get_tpu_strategy(enable_packed_var)
 
@@ -379,41 +304,6 @@ class TPUStrategyTest(test.TestCase, parameterized.TestCase):
     train_step()
     self.assertEqual(2.0, v.numpy())
 
-  def test_cluster_in_graph_and_while_body_fn(self, enable_packed_var):
-    strategy = get_tpu_strategy(enable_packed_var)
-
-    @def_function.function
-    def train_step():
-
-      def step_fn(prev):
-        s = prev + 1
-        return s
-
-      def init_fn():
-        return array_ops.zeros(shape=())
-
-      prev = strategy.run(init_fn)
-      for _ in math_ops.range(10):
-        prev = strategy.run(step_fn, args=(prev,))
-      return strategy.reduce(reduce_util.ReduceOp.SUM, prev, axis=None)
-
-    sum_val = train_step().numpy().astype(float)
-    self.assertEqual(sum_val, strategy.num_replicas_in_sync * 10)
-
-  def test_two_clusters_with_same_fn(self, enable_packed_var):
-    strategy = get_tpu_strategy(enable_packed_var)
-
-    @def_function.function
-    def foo(x):
-      return strategy.run(lambda x: x + 1, (x,))
-
-    @def_function.function
-    def bar(x):
-      foo(x)
-      return foo(x)
-
-    bar(1)
-
   def test_using_external_variable_inside_tf_function(self, enable_packed_var):
     strategy = get_tpu_strategy(enable_packed_var)
     dataset = dataset_ops.Dataset.range(
@@ -475,33 +365,12 @@ class TPUStrategyTest(test.TestCase, parameterized.TestCase):
     self.assertAllEqual(expected_result, run(input_iterator))
     self.assertAllEqual((0.,), w.read_value())
 
-  def test_run_output_on_device(self, enable_packed_var):
-    strategy = get_tpu_strategy(enable_packed_var)
-
-    def computation(x):
-      return math_ops.square(x)
-
-    @def_function.function
-    def train_step():
-      outputs = strategy.experimental_local_results(
-          strategy.run(computation, args=(2,)))
-      return outputs
-
-    results = train_step()
-    self.assertAllEqual([4., 4.], results)
-    self.assertAllEqual("/job:localhost/replica:0/task:0/device:TPU:0",
-                        results[0].backing_device)
-    self.assertAllEqual("/job:localhost/replica:0/task:0/device:TPU:1",
-                        results[1].backing_device)
-
   def test_composite_input_output(self, enable_packed_var):
     strategy = get_tpu_strategy(enable_packed_var)
     if strategy.num_replicas_in_sync != 2:
       self.skipTest("Test assumes two replicas.")
 
-    with strategy.scope():
-      table = variables.Variable(
-          initial_value=[[0.0, 1.0], [3.0, 7.0]], dtype=dtypes.float32)
+    table, dataset = _create_table_and_sparse_dataset(strategy)
 
     @def_function.function
     def sparse_lookup(iterator):
@@ -517,23 +386,6 @@ class TPUStrategyTest(test.TestCase, parameterized.TestCase):
           strategy.experimental_local_results,
           strategy.run(tpu_function, args=(next(iterator),)))
 
-    def dataset_fn(_):
-      dataset = dataset_ops.Dataset.range(2)
-
-      def make_sparse(_):
-        return sparse_tensor.SparseTensor(
-            indices=array_ops.constant([[0, 0], [1, 0], [1, 1]],
-                                       dtype=dtypes.int64),
-            values=array_ops.constant([0, 0, 1], dtype=dtypes.int32),
-            dense_shape=array_ops.constant([2, 2], dtype=dtypes.int64))
-
-      return dataset.map(make_sparse)
-
-    dataset = iter(
-        strategy.distribute_datasets_from_function(
-            dataset_fn,
-            distribute_lib.InputOptions(experimental_prefetch_to_device=False)))
-
     sparse, result = sparse_lookup(dataset)
 
     # All replicas return identical reults.
@@ -549,9 +401,7 @@ class TPUStrategyTest(test.TestCase, parameterized.TestCase):
     if strategy.num_replicas_in_sync != 2:
       self.skipTest("Test assumes two replicas.")
 
-    with strategy.scope():
-      table = variables.Variable(
-          initial_value=[[0.0, 1.0], [3.0, 7.0]], dtype=dtypes.float32)
+    table, dataset = _create_table_and_sparse_dataset(strategy)
 
     @def_function.function
     def sparse_lookup(iterator):
@@ -567,23 +417,6 @@ class TPUStrategyTest(test.TestCase, parameterized.TestCase):
           strategy.experimental_local_results,
           strategy.run(tpu_function, args=(next(iterator),)))
 
-    def dataset_fn(_):
-      dataset = dataset_ops.Dataset.range(2)
-
-      def make_sparse(_):
-        return sparse_tensor.SparseTensor(
-            indices=array_ops.constant([[0, 0], [1, 0], [1, 1]],
-                                       dtype=dtypes.int64),
-            values=array_ops.constant([0, 0, 1], dtype=dtypes.int32),
-            dense_shape=array_ops.constant([2, 2], dtype=dtypes.int64))
-
-      return dataset.map(make_sparse)
-
-    dataset = iter(
-        strategy.distribute_datasets_from_function(
-            dataset_fn,
-            distribute_lib.InputOptions(experimental_prefetch_to_device=False)))
-
     output = sparse_lookup(dataset)
 
     # All replicas return identical reults.
@@ -597,9 +430,192 @@ class TPUStrategyTest(test.TestCase, parameterized.TestCase):
       self.assertAllEqual(output["segment_sum"][replica],
                           [[0.0, 1.0], [3.0, 8.0]])
 
-  def test_composite_input_dynamic_shapes_outside_compilation(
-      self, enable_packed_var):
+  def test_per_device_tracing_of_mirrored_variables(self, enable_packed_var):
+    # Define trace_count as a list to avoid python scoping error
+    trace_count = [0]
+
     strategy = get_tpu_strategy(enable_packed_var)
+    with strategy.scope():
+      variable = variables.Variable(0.0)
+
+    @def_function.function
+    def add_one():
+      trace_count[0] = trace_count[0] + 1
+      return math_ops.add(variable, constant_op.constant(1.0))
+
+    @def_function.function
+    def update_variable():
+      for device in set(strategy.extended.worker_devices):
+        with ops.device(device):
+          add_one()
+
+    with strategy.scope():
+      update_variable.get_concrete_function()
+      self.assertLen(strategy.extended.worker_devices, trace_count[0])
+
+
+# TPUStrategy tests which don't create variables under the strategy scope, so
+# they don't depend on whether variables are packed.
+class TPUStrategyNoPackedVarTest(test.TestCase):
+
+  def test_sequential_runs(self):
+    resolver, topology = connect_and_initialize_tpu_system()
+    # Computation replicated to all cores.
+    device_assignment = device_assignment_lib.DeviceAssignment.build(
+        topology, num_replicas=2)
+    strategy = tpu_lib.TPUStrategyV2(
+        resolver, experimental_device_assignment=device_assignment)
+
+    # Computation on the 1st core.
+    device_assignment2 = device_assignment_lib.DeviceAssignment.build(
+        topology, num_replicas=1)
+    strategy2 = tpu_lib.TPUStrategyV2(
+        resolver, experimental_device_assignment=device_assignment2)
+
+    def computation(x):
+      return math_ops.square(x)
+
+    @def_function.function
+    def train_step():
+      outputs = strategy.experimental_local_results(
+          strategy.run(computation, args=([2., 2.],)))
+      outputs2 = strategy2.run(
+          computation, args=([outputs[0]],))
+      return outputs2
+
+    self.assertAllEqual([[16., 16.]], train_step())
+
+  def test_recover_from_compilation_failures(self):
+    # TODO(b/148150981): Stop skipping this test once recovery works
+    # for non-local TPU.
+    if FLAGS.tpu:
+      self.skipTest("Recovery fails for non-local TPU, see b/148150981")
+
+    # Disable automatic outside compilation.
+    config.set_soft_device_placement(False)
+    strategy = get_tpu_strategy()
+
+    @def_function.function
+    def compilation_failure_run():
+
+      def computation():
+        return random_ops.random_gamma([10], [0.5, 1.5])
+
+      return strategy.run(computation)
+
+    with self.assertRaises(errors.OpError):
+      compilation_failure_run()
+
+    @def_function.function
+    def good_run():
+
+      def computation():
+        return random_ops.random_normal([10])
+
+      return strategy.run(computation)
+
+    good_run()
+
+  def test_dynamic_shape_with_outside_compilation_failure(self):
+    # Enable automatic outside compilation.
+    config.set_soft_device_placement(True)
+    strategy = get_tpu_strategy()
+    dataset = dataset_ops.Dataset.from_tensors(("string", 1.0)).repeat().batch(
+        2, drop_remainder=False)
+    dataset = strategy.experimental_distribute_dataset(dataset)
+    iterator = iter(dataset)
+
+    @def_function.function
+    def train_fn(iterator):
+
+      def step_fn(inputs):
+        _, inputs = inputs
+        return math_ops.reduce_sum(inputs)
+
+      return strategy.experimental_local_results(
+          strategy.run(step_fn, args=(next(iterator),)))
+
+    with self.assertRaisesRegex(errors.InternalError, "Compilation failure"):
+      logging.info(train_fn(iterator))
+
+  def test_worker_devices_on_subset_cores(self):
+    resolver, topology = connect_and_initialize_tpu_system()
+
+    # Strategy for the 1st core.
+    device_assignment = device_assignment_lib.DeviceAssignment.build(
+        topology, num_replicas=1)
+    first_core_strategy = tpu_lib.TPUStrategyV2(
+        resolver, experimental_device_assignment=device_assignment)
+
+    # Strategy for the 2nd core.
+    device_assignment2 = device_assignment_lib.DeviceAssignment(
+        topology, [[[0, 0, 0, 1]]])
+    second_core_strategy = tpu_lib.TPUStrategyV2(
+        resolver, experimental_device_assignment=device_assignment2)
+
+    self.assertLen(first_core_strategy.extended.worker_devices, 1)
+    self.assertEndsWith(first_core_strategy.extended.worker_devices[0],
+                        "device:TPU:0")
+
+    self.assertLen(second_core_strategy.extended.worker_devices, 1)
+    self.assertEndsWith(second_core_strategy.extended.worker_devices[0],
+                        "device:TPU:1")
+
+  def test_cluster_in_graph_and_while_body_fn(self):
+    strategy = get_tpu_strategy()
+
+    @def_function.function
+    def train_step():
+
+      def step_fn(prev):
+        s = prev + 1
+        return s
+
+      def init_fn():
+        return array_ops.zeros(shape=())
+
+      prev = strategy.run(init_fn)
+      for _ in math_ops.range(10):
+        prev = strategy.run(step_fn, args=(prev,))
+      return strategy.reduce(reduce_util.ReduceOp.SUM, prev, axis=None)
+
+    self.assertAllEqual(strategy.num_replicas_in_sync * 10., train_step())
+
+  def test_two_clusters_with_same_fn(self):
+    strategy = get_tpu_strategy()
+
+    @def_function.function
+    def foo(x):
+      return strategy.run(lambda x: x + 1, (x,))
+
+    @def_function.function
+    def bar(x):
+      foo(x)
+      return foo(x)
+
+    bar(1)
+
+  def test_run_output_on_device(self):
+    strategy = get_tpu_strategy()
+
+    def computation(x):
+      return math_ops.square(x)
+
+    @def_function.function
+    def train_step():
+      outputs = strategy.experimental_local_results(
+          strategy.run(computation, args=(2,)))
+      return outputs
+
+    results = train_step()
+    self.assertAllEqual([4., 4.], results)
+    self.assertAllEqual("/job:localhost/replica:0/task:0/device:TPU:0",
+                        results[0].backing_device)
+    self.assertAllEqual("/job:localhost/replica:0/task:0/device:TPU:1",
+                        results[1].backing_device)
+
+  def test_composite_input_dynamic_shapes_outside_compilation(self):
+    strategy = get_tpu_strategy()
     if strategy.num_replicas_in_sync != 2:
       self.skipTest("Test assumes two replicas.")
 
@@ -643,128 +659,65 @@ class TPUStrategyTest(test.TestCase, parameterized.TestCase):
     result = sparse_lookup(dataset)
     self.assertAllEqual(result, [[0.0, 2.0], [1.5, 5.0]])
 
-  def test_per_device_tracing_of_mirrored_variables(self, enable_packed_var):
-    # Define trace_count as a list to avoid python scoping error
-    trace_count = [0]
-
-    strategy = get_tpu_strategy(enable_packed_var)
-    with strategy.scope():
-      variable = variables.Variable(0.0)
-
-    @def_function.function
-    def add_one():
-      trace_count[0] = trace_count[0] + 1
-      return math_ops.add(variable, constant_op.constant(1.0))
-
-    @def_function.function
-    def update_variable():
-      for device in set(strategy.extended.worker_devices):
-        with ops.device(device):
-          add_one()
-
-    with strategy.scope():
-      update_variable.get_concrete_function()
-      self.assertLen(strategy.extended.worker_devices, trace_count[0])
 
+def _sparse_tensor():
+  # Values here aren't important.
+  return sparse_tensor.SparseTensor(
+      indices=[[0, 0], [0, 1], [1, 0]], values=[1, 2, 3], dense_shape=[2, 2])
 
-class TPUStrategyDataPrefetchTest(test.TestCase):
 
-  def test_prefetch_to_device_default(self):
-    strategy = get_tpu_strategy()
-    dataset = dataset_ops.Dataset.range(
-        strategy.num_replicas_in_sync * 2,
-        output_type=dtypes.float32).batch(strategy.num_replicas_in_sync)
+def _ragged_tensor():
+  # Values here aren't important.
+  return ragged_tensor.RaggedTensor.from_row_splits(
+      values=[1, 2, 3], row_splits=[0, 2, 3])
 
-    # Check default, should prefetch to TPU.
-    dataset_item = next(iter(strategy.experimental_distribute_dataset(dataset)))
-    dataset_location = tf_device.DeviceSpec.from_string(
-        dataset_item.values[0].device)
-    self.assertEqual(dataset_location.device_type, "TPU")
 
-  def test_prefetch_to_device_tpu(self):
-    strategy = get_tpu_strategy()
-    dataset = dataset_ops.Dataset.range(
-        strategy.num_replicas_in_sync * 2,
-        output_type=dtypes.float32).batch(strategy.num_replicas_in_sync)
+class TPUStrategyDataPrefetchTest(test.TestCase, parameterized.TestCase):
 
-    input_options = distribute_lib.InputOptions(
-        experimental_prefetch_to_device=True)
-    dataset_item = next(iter(strategy.experimental_distribute_dataset(
-        dataset, options=input_options)))
-    dataset_location = tf_device.DeviceSpec.from_string(
-        dataset_item.values[0].device)
-    self.assertEqual(dataset_location.device_type, "TPU")
-
-  def test_prefetch_to_device_cpu(self):
+  @parameterized.named_parameters(
+      # Check default, should prefetch to TPU.
+      ("default", None, "TPU"),
+      ("tpu", True, "TPU"),
+      # Should be CPU when prefetch_to_device is False.
+      ("cpu", False, "CPU"),
+  )
+  def test_prefetch_to_device(self, prefetch_to_device, expected_device_type):
     strategy = get_tpu_strategy()
     dataset = dataset_ops.Dataset.range(
         strategy.num_replicas_in_sync * 2,
         output_type=dtypes.float32).batch(strategy.num_replicas_in_sync)
 
-    # Should be CPU when prefetch_to_device is False.
-    input_options = distribute_lib.InputOptions(
-        experimental_prefetch_to_device=False)
+    if prefetch_to_device is None:
+      input_options = None
+    else:
+      input_options = distribute_lib.InputOptions(
+          experimental_prefetch_to_device=prefetch_to_device)
     dataset_item = next(iter(strategy.experimental_distribute_dataset(
         dataset, options=input_options)))
     dataset_location = tf_device.DeviceSpec.from_string(
         dataset_item.values[0].device)
-    self.assertEqual(dataset_location.device_type, "CPU")
-
-  def test_prefetch_to_device_sparse_dataset(self):
-    strategy = get_tpu_strategy()
-    # Values here aren't important.
-    dataset = dataset_ops.Dataset.from_tensors(
-        sparse_tensor.SparseTensor(indices=[[0, 0], [0, 1], [1, 0]],
-                                   values=[1, 2, 3],
-                                   dense_shape=[2, 2]))
-    dataset = dataset.repeat()
-    dataset = dataset.batch(strategy.num_replicas_in_sync)
-
-    with self.assertRaisesRegex(ValueError, "TPUStrategy does not support"):
-      iter(strategy.experimental_distribute_dataset(dataset))
+    self.assertEqual(dataset_location.device_type, expected_device_type)
 
-  def test_prefetch_to_device_ragged_dataset(self):
-    strategy = get_tpu_strategy()
-    # Values here aren't important.
-    dataset = dataset_ops.Dataset.from_tensors(
-        ragged_tensor.RaggedTensor.from_row_splits(
-            values=[1, 2, 3],
-            row_splits=[0, 2, 3]))
-    dataset = dataset.repeat()
-    dataset = dataset.batch(strategy.num_replicas_in_sync)
-
-    with self.assertRaisesRegex(ValueError, "TPUStrategy does not support"):
-      iter(strategy.experimental_distribute_dataset(dataset))
-
-  def test_prefetch_to_device_sparse_dataset_fn(self):
+  @parameterized.named_parameters(
+      ("sparse_dataset", _sparse_tensor, False),
+      ("ragged_dataset", _ragged_tensor, False),
+      ("sparse_dataset_fn", _sparse_tensor, True),
+      ("ragged_dataset_fn", _ragged_tensor, True),
+  )
+  def test_prefetch_to_device_composite(self, make_value, from_function):
     strategy = get_tpu_strategy()
-    def dataset_fn(ctx):
-      del ctx
-      # Values here aren't important.
-      dataset = dataset_ops.Dataset.from_tensors(
-          sparse_tensor.SparseTensor(indices=[[0, 0], [0, 1], [1, 0]],
-                                     values=[1, 2, 3],
-                                     dense_shape=[2, 2]))
-      dataset = dataset.repeat()
-      return dataset.batch(strategy.num_replicas_in_sync)
-
-    with self.assertRaisesRegex(ValueError, "TPUStrategy does not support"):
-      iter(strategy.distribute_datasets_from_function(dataset_fn))
 
-  def test_prefetch_to_device_ragged_dataset_fn(self):
-    strategy = get_tpu_strategy()
     def dataset_fn(ctx):
       del ctx
-      # Values here aren't important.
-      dataset = dataset_ops.Dataset.from_tensors(
-          ragged_tensor.RaggedTensor.from_row_splits(
-              values=[1, 2, 3],
-              row_splits=[0, 2, 3]))
+      dataset = dataset_ops.Dataset.from_tensors(make_value())
       dataset = dataset.repeat()
       return dataset.batch(strategy.num_replicas_in_sync)
 
     with self.assertRaisesRegex(ValueError, "TPUStrategy does not support"):
-      iter(strategy.distribute_datasets_from_function(dataset_fn))
+      if from_function:
+        iter(strategy.distribute_datasets_from_function(dataset_fn))
+      else:
+        iter(strategy.experimental_distribute_dataset(dataset_fn(None)))
 
 
 class TPUStrategyDistributionTest(
@@ -772,9 +725,7 @@ class TPUStrategyDistributionTest(
     strategy_test_lib.TwoDeviceDistributionTestBase):
 
   def test_update_config_proto(self):
-    resolver = get_tpu_cluster_resolver()
-    remote.connect_to_cluster(resolver)
-    tpu_strategy_util.initialize_tpu_system(resolver)
+    resolver, _ = connect_and_initialize_tpu_system()
     strategy = tpu_lib.TPUStrategyV2(resolver)
 
     config_proto = config_pb2.ConfigProto()
@@ -900,9 +851,7 @@ class TPUStrategyDistributionTest(
     self._test_trainable_variable(strategy)
 
   def test_model_parallelism(self):
-    resolver = get_tpu_cluster_resolver()
-    remote.connect_to_cluster(resolver)
-    topology = tpu_strategy_util.initialize_tpu_system(resolver)
+    resolver, topology = connect_and_initialize_tpu_system()
     device_assignment = device_assignment_lib.DeviceAssignment(
         topology, core_assignment=[[[0, 0, 0, 0], [0, 0, 0, 1]]])
     strategy = tpu_lib.TPUStrategyV2(
@@ -969,9 +918,7 @@ class TPUStrategyDistributionTest(
         return control_flow_ops.group([self.v.assign(v_new),
                                        self.w.assign(w_new)])
 
-    resolver = get_tpu_cluster_resolver()
-    remote.connect_to_cluster(resolver)
-    topology = tpu_strategy_util.initialize_tpu_system(resolver)
+    resolver, topology = connect_and_initialize_tpu_system()
     device_assignment = device_assignment_lib.DeviceAssignment(
         topology, core_assignment=[[[0, 0, 0, 0], [0, 0, 0, 1]]])
     strategy = tpu_lib.TPUStrategyV2(
@@ -1005,9 +952,7 @@ class TPUStrategyDistributionTest(
 class DeviceAssignmentTest(test.TestCase):
 
   def test_core_assignment(self):
-    resolver = get_tpu_cluster_resolver()
-    remote.connect_to_cluster(resolver)
-    topology = tpu_strategy_util.initialize_tpu_system(resolver)
+    resolver, topology = connect_and_initialize_tpu_system()
     device_assignment = device_assignment_lib.DeviceAssignment(
         topology, core_assignment=[[[0, 0, 0, 0]]])
     self.assertAllEqual([[[0, 0, 0, 0]]], device_assignment.core_assignment)
@@ -1017,9 +962,7 @@ class DeviceAssignmentTest(test.TestCase):
     self.assertEqual("/task:0/device:CPU:0", device_assignment.host_device())
 
   def test_device_assignment_strategy_properties(self):
-    resolver = get_tpu_cluster_resolver()
-    remote.connect_to_cluster(resolver)
-    topology = tpu_strategy_util.initialize_tpu_system(resolver)
+    resolver, topology = connect_and_initialize_tpu_system()
     device_assignment = device_assignment_lib.DeviceAssignment(
         topology, core_assignment=[[[0, 0, 0, 0]]])
     strategy = tpu_lib.TPUStrategyV2(
@@ -1030,9 +973,7 @@ class DeviceAssignmentTest(test.TestCase):
     self.assertEqual(strategy.extended.num_replicas_per_host, 1)  # pylint: disable=protected-access
 
   def test_device_assignment_constants(self):
-    resolver = get_tpu_cluster_resolver()
-    remote.connect_to_cluster(resolver)
-    topology = tpu_strategy_util.initialize_tpu_system(resolver)
+    resolver, topology = connect_and_initialize_tpu_system()
     device_assignment = device_assignment_lib.DeviceAssignment(
         topology,
         core_assignment=device_assignment_lib.SINGLE_CORE_ASSIGNMENT)
@@ -1043,9 +984,7 @@ class DeviceAssignmentTest(test.TestCase):
     self.assertEqual("/task:0/device:CPU:0", device_assignment.host_device())
 
   def test_variables_mismatched_device_assignment(self):
-    resolver = get_tpu_cluster_resolver()
-    remote.connect_to_cluster(resolver)
-    topology = tpu_strategy_util.initialize_tpu_system(resolver)
+    resolver, topology = connect_and_initialize_tpu_system()
 
     strategy0 = tpu_lib.TPUStrategyV2(resolver)
     self.assertEqual(